@@ -1,13 +1,79 @@
 import os
+import re
 import json
+import hashlib
 import logging
+import asyncio
+import random
+import threading
+import warnings
 from typing import Dict, List, Optional
 import httpx
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import time
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON parsing
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # optional: SIMD JSON parsing, preferred over orjson
+    simdjson = None
+
 logger = logging.getLogger(__name__)
 
+# Bump when prompts change so cached enrichment results are not reused
+PROMPT_VERSION = "v1.0"
+
+# Cache tag for results parsed from the multi-bio batch prompt, kept apart from
+# single-prompt results; bump when the batch prompt changes
+BATCH_PROMPT_VERSION = f"{PROMPT_VERSION}-batch-v1"
+
+_simdjson_local = threading.local()
+
+
+def _simdjson_loads(data):
+    """Parse JSON with a per-thread simdjson parser (parsers are not thread-safe)"""
+    parser = getattr(_simdjson_local, 'parser', None)
+    if parser is None:
+        parser = _simdjson_local.parser = simdjson.Parser()
+    
+    if isinstance(data, str):
+        data = data.encode()
+    try:
+        return parser.parse(data, recursive=True)
+    except ValueError as e:
+        # Surface the same exception type as json/orjson so callers catch one thing
+        raise json.JSONDecodeError(str(e), data.decode(errors='replace'), 0) from e
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+if simdjson:
+    _json_loads = _simdjson_loads
+elif orjson:
+    _json_loads = orjson.loads
+else:
+    _json_loads = json.loads
+_json_dumps = orjson.dumps if orjson else (lambda obj: json.dumps(obj).encode())
+
+# Stand-in for the bio when pre-rendering the enrichment prompt template
+_BIO_PLACEHOLDER = '\x00bio\x00'
+
+# JSON object or array wrapped in a markdown code fence, e.g. ```json {...} ```
+_FENCED_JSON_RE = re.compile(r'```(?:json)?\s*([\[{].*?[\]}])\s*```', re.S)
+
+
+def _extract_json(raw_text: str) -> str:
+    """Return the JSON payload of a model response, unwrapping markdown fences if present"""
+    text = raw_text.lstrip()
+    if text.startswith(('{', '[')):
+        return text
+    
+    match = _FENCED_JSON_RE.search(text)
+    return match.group(1) if match else text
+
 
 @dataclass
 class EnrichmentResult:
@@ -19,26 +85,103 @@ class EnrichmentResult:
     raw_response: str
 
 
+class TokenBucket:
+    """
+    Async token-bucket rate limiter with adaptive backoff
+    
+    Allows bursts of up to `burst` requests and refills at `rate_per_sec`.
+    A 429 drains the bucket and pauses refills for a jittered exponential
+    backoff (or the server's Retry-After), so every in-flight worker backs off
+    together. The backoff escalates at most once per window: 429s for requests
+    sent before the current backoff began are answers to the same episode.
+    """
+    
+    def __init__(self, rate_per_sec: float, burst: int = 1,
+                 backoff_base: float = 1.0, max_backoff: float = 60.0):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.consecutive_429s = 0
+        self.backoff_started_at = float('-inf')
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> float:
+        """Wait until a request may be sent and return the send time"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now > self.updated_at:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate_per_sec)
+                    self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return now
+                
+                # updated_at is in the future while backing off from a 429
+                await asyncio.sleep(max(0.0, self.updated_at - now) + (1 - self.tokens) / self.rate_per_sec)
+    
+    def on_rate_limited(self, retry_after: Optional[float] = None,
+                        sent_at: Optional[float] = None) -> float:
+        """
+        Drain the bucket after a 429 and return the backoff in seconds
+        
+        Args:
+            retry_after: Server-requested wait, used instead of the exponential backoff
+            sent_at: Send time returned by acquire(); a request sent before the
+                current backoff began waits out that backoff without extending it
+        """
+        now = time.monotonic()
+        if sent_at is not None and sent_at < self.backoff_started_at:
+            return max(0.0, self.updated_at - now)
+        
+        self.consecutive_429s += 1
+        self.backoff_started_at = now
+        if retry_after is not None:
+            wait = retry_after
+        else:
+            backoff = self.backoff_base * 2 ** (self.consecutive_429s - 1) * random.uniform(0.8, 1.2)
+            wait = min(backoff, self.max_backoff)
+        
+        self.tokens = 0.0
+        self.updated_at = max(self.updated_at, now + wait)
+        return wait
+    
+    def on_success(self, sent_at: Optional[float] = None):
+        """Reset the backoff after a successful request sent since the last 429"""
+        if sent_at is None or sent_at >= self.backoff_started_at:
+            self.consecutive_429s = 0
+
+
 class PromptManager:
     """Manages AI prompts with config-driven approach"""
     
+    # Parsed prompt configs shared across instances, keyed by config path
+    _prompts_cache: Dict[str, Dict] = {}
+    
     def __init__(self, config_path: str = 'prompts_config.json'):
         self.config_path = config_path
-        self.prompts = self.load_prompts()
+        
+        if config_path not in PromptManager._prompts_cache:
+            PromptManager._prompts_cache[config_path] = self.load_prompts()
+        self.prompts = PromptManager._prompts_cache[config_path]
+        
+        # Render the template once around a placeholder; per-bio prompts are then
+        # plain concatenation instead of re-parsing the format string every call
+        self._prompt_parts = self.prompts["enrichment_prompt"].format(bio=_BIO_PLACEHOLDER).split(_BIO_PLACEHOLDER)
     
     def load_prompts(self) -> Dict:
-        """Load prompts from config file"""
-        if os.path.exists(self.config_path):
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
-        else:
-            # Default prompts
-            default_prompts = {
-                "system_context": """You are an AI assistant helping the CMT Association (Chartered Market Technician) 
+        """Load prompts from config file, using the defaults for any missing prompt"""
+        # Default prompts
+        default_prompts = {
+            "system_context": """You are an AI assistant helping the CMT Association (Chartered Market Technician) 
 analyze volunteer member profiles. The CMT Association is a global credentialing body for technical analysts 
 and market professionals. They need to match volunteers with opportunities based on skills and readiness.""",
-                
-                "enrichment_prompt": """Analyze this member profile and extract structured information:
+            
+            "enrichment_prompt": """Analyze this member profile and extract structured information:
 
 Member Bio/Comment: {bio}
 
@@ -60,18 +203,53 @@ Persona Definitions:
 - Active Learner: Enthusiastic, actively learning, engaged
 - Expert Contributor: Advanced skills, built systems, research background
 
-Respond ONLY with valid JSON, no other text."""
-            }
+Respond ONLY with valid JSON, no other text.""",
             
-            # Save default prompts
-            with open(self.config_path, 'w') as f:
-                json.dump(default_prompts, f, indent=2)
-            
-            return default_prompts
+            "batch_enrichment_prompt": """Analyze each of the following {count} numbered member profiles and extract structured information:
+
+{bios}
+
+For each numbered bio, provide your analysis as a JSON object with these exact fields:
+{{
+  "skills": [list of technical/professional skills mentioned or implied],
+  "persona": "one of: Mentor Material | Needs Guidance | Passive | Active Learner | Expert Contributor",
+  "confidence_score": 0-100 integer based on clarity and detail of bio,
+  "reasoning": "brief explanation of persona classification"
+}}
+
+Skills should include: programming languages (Python, R, etc.), financial domains (derivatives, options, algo trading, etc.), 
+technical tools (pandas, numpy, machine learning, etc.), and soft skills (mentoring, teaching, etc.).
+
+Persona Definitions:
+- Mentor Material: Experienced, offers to help, has mentored before
+- Needs Guidance: Beginner, struggling, explicitly asks for help
+- Passive: Minimal engagement, vague interest
+- Active Learner: Enthusiastic, actively learning, engaged
+- Expert Contributor: Advanced skills, built systems, research background
+
+Respond ONLY with a valid JSON array of exactly {count} objects, in the same order as the numbered bios, no other text."""
+        }
+        
+        if os.path.exists(self.config_path):
+            with open(self.config_path, 'rb') as f:
+                # Configs saved before a prompt was added lack its key
+                return {**default_prompts, **_json_loads(f.read())}
+        
+        # Save default prompts
+        with open(self.config_path, 'w') as f:
+            json.dump(default_prompts, f, indent=2)
+        
+        return default_prompts
     
     def get_enrichment_prompt(self, bio: str) -> str:
         """Generate enrichment prompt for a bio"""
-        return self.prompts["enrichment_prompt"].format(bio=bio)
+        return bio.join(self._prompt_parts)
+    
+    def get_batch_enrichment_prompt(self, bios: List[str]) -> str:
+        """Generate a single enrichment prompt covering several numbered bios"""
+        # One line per bio so the numbering stays unambiguous
+        numbered = '\n'.join(f"{i}. {' '.join(bio.split())}" for i, bio in enumerate(bios, 1))
+        return self.prompts["batch_enrichment_prompt"].format(count=len(bios), bios=numbered)
     
     def get_system_context(self) -> str:
         """Get system context prompt"""
@@ -81,13 +259,16 @@ Respond ONLY with valid JSON, no other text."""
 class AIEnricher:
     """Handles AI-based enrichment of member data"""
     
-    def __init__(self, api_key: str = None, model_name: str = None):
+    def __init__(self, api_key: str = None, model_name: str = None,
+                 cache=None, force_refresh: bool = False):
         """
         Initialize AI enricher
         
         Args:
             api_key: OpenRouter API key (or set OPENROUTER_API_KEY env var)
             model_name: Model to use (defaults to openai/gpt-4o-mini if None)
+            cache: DatabaseManager used as a persistent cache of enrichment results
+            force_refresh: Ignore cached results (fresh results are still cached)
         """
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
         if not self.api_key:
@@ -96,22 +277,31 @@ class AIEnricher:
         # Default to a good, cost-effective model
         self.model_name = model_name or "openai/gpt-4o-mini"
         
+        self.cache = cache
+        self.force_refresh = force_refresh
+        
         # OpenRouter API endpoint
         self.api_url = "https://openrouter.ai/api/v1/chat/completions"
         
-        # HTTP client
-        self.client = httpx.Client(
-            timeout=60.0,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/cmt-volunteer-system",  # Optional: for analytics
-                "X-Title": "CMT Volunteer System"  # Optional: for analytics
-            }
-        )
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/cmt-volunteer-system",  # Optional: for analytics
+            "X-Title": "CMT Volunteer System"  # Optional: for analytics
+        }
+        
+        # HTTP/2 lets concurrent requests multiplex over a single TLS connection
+        self.limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        
+        # HTTP clients (async client is created lazily inside the running event loop)
+        self.client = httpx.Client(timeout=60.0, headers=self.headers, http2=True, limits=self.limits)
+        self.async_client: Optional[httpx.AsyncClient] = None
         
         self.prompt_manager = PromptManager()
         
+        # The system message is identical for every bio, so build it once and share it
+        self._system_msg = {"role": "system", "content": self.prompt_manager.get_system_context()}
+        
         logger.info(f"Initialized AIEnricher with model: {self.model_name}")
         
         # Test the connection
@@ -134,7 +324,7 @@ class AIEnricher:
                 }
             )
             response.raise_for_status()
-            logger.info("✓ API connection test successful")
+            logger.info(f"✓ API connection test successful ({response.http_version})")
         except Exception as e:
             raise ValueError(f"Failed to connect to OpenRouter API: {e}")
     
@@ -160,14 +350,16 @@ class AIEnricher:
                 )
                 response.raise_for_status()
                 
-                data = response.json()
+                data = _json_loads(response.content)
                 content = data["choices"][0]["message"]["content"]
                 return content.strip()
                 
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429:
                     # Rate limit - wait longer
-                    wait_time = (attempt + 1) * 2
+                    wait_time = self._retry_after(e.response)
+                    if wait_time is None:
+                        wait_time = (attempt + 1) * 2
                     logger.warning(f"Rate limited. Waiting {wait_time} seconds...")
                     time.sleep(wait_time)
                     continue
@@ -184,51 +376,217 @@ class AIEnricher:
         
         raise Exception("Max retries exceeded")
     
-    def enrich_bio(self, bio: str, retry_count: int = 3) -> EnrichmentResult:
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Seconds requested by the server's Retry-After header, if any"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return None
+    
+    def _get_async_client(self, max_connections: Optional[int] = None) -> httpx.AsyncClient:
         """
-        Enrich a single bio with AI analysis
+        Get the shared async HTTP client, creating it on first use
         
         Args:
-            bio: Member bio/comment text
-            retry_count: Number of retries on failure
+            max_connections: Pool size for a newly created client, so the pool
+                never becomes the bottleneck below the batch concurrency
         """
-        user_prompt = self.prompt_manager.get_enrichment_prompt(bio)
-        system_context = self.prompt_manager.get_system_context()
+        if self.async_client is None:
+            limits = self.limits
+            if max_connections:
+                limits = httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                )
+            self.async_client = httpx.AsyncClient(
+                timeout=60.0, headers=self.headers, http2=True, limits=limits
+            )
+        return self.async_client
+    
+    async def aclose(self):
+        """Close the async HTTP client (it is bound to the event loop that created it)"""
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
+    
+    async def _acall_api(self, messages: List[Dict], retry_count: int = 3,
+                         rate_limiter: Optional[TokenBucket] = None) -> str:
+        """
+        Async variant of _call_api using the shared httpx.AsyncClient
         
-        messages = [
-            {"role": "system", "content": system_context},
-            {"role": "user", "content": user_prompt}
-        ]
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            retry_count: Number of retries on failure
+            rate_limiter: Shared limiter to acquire from before each request
+        """
+        client = self._get_async_client()
         
         for attempt in range(retry_count):
             try:
-                raw_text = self._call_api(messages, retry_count=1)
+                if rate_limiter:
+                    sent_at = await rate_limiter.acquire()
                 
-                # Extract JSON from response (handle markdown code blocks)
-                json_text = raw_text
-                if '```json' in raw_text:
-                    json_text = raw_text.split('```json')[1].split('```')[0].strip()
-                elif '```' in raw_text:
-                    json_text = raw_text.split('```')[1].split('```')[0].strip()
-                
-                # Parse JSON
-                data = json.loads(json_text)
-                
-                # Validate and normalize
-                result = EnrichmentResult(
-                    skills=data.get('skills', []),
-                    persona=data.get('persona', 'Unknown'),
-                    confidence_score=float(data.get('confidence_score', 0)) / 100.0,  # Normalize to 0-1
-                    reasoning=data.get('reasoning', ''),
-                    raw_response=raw_text
+                response = await client.post(
+                    self.api_url,
+                    json={
+                        "model": self.model_name,
+                        "messages": messages
+                    }
                 )
+                response.raise_for_status()
                 
-                # Validate confidence score
-                if not 0 <= result.confidence_score <= 1:
-                    result.confidence_score = max(0, min(1, result.confidence_score))
+                if rate_limiter:
+                    rate_limiter.on_success(sent_at)
                 
-                logger.debug(f"Enriched bio: {bio[:50]}... -> Persona: {result.persona}, Confidence: {result.confidence_score:.2f}")
+                data = _json_loads(response.content)
+                content = data["choices"][0]["message"]["content"]
+                return content.strip()
                 
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    # Rate limit - back off (shared with all workers when a limiter is in use)
+                    retry_after = self._retry_after(e.response)
+                    if rate_limiter:
+                        wait_time = rate_limiter.on_rate_limited(retry_after, sent_at)
+                    else:
+                        wait_time = retry_after if retry_after is not None else (attempt + 1) * 2
+                    logger.warning(f"Rate limited. Waiting {wait_time:.1f} seconds...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    logger.error(f"API error (attempt {attempt + 1}/{retry_count}): {e}")
+                    if attempt == retry_count - 1:
+                        raise
+                    await asyncio.sleep(1)
+            except Exception as e:
+                logger.error(f"API call error (attempt {attempt + 1}/{retry_count}): {e}")
+                if attempt == retry_count - 1:
+                    raise
+                await asyncio.sleep(1)
+        
+        raise Exception("Max retries exceeded")
+    
+    def _build_messages(self, bio: str) -> List[Dict]:
+        """Build the chat messages for a single bio"""
+        user_prompt = self.prompt_manager.get_enrichment_prompt(bio)
+        
+        return [
+            self._system_msg,
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _build_batch_messages(self, bios: List[str]) -> List[Dict]:
+        """Build the chat messages for a numbered batch of bios"""
+        user_prompt = self.prompt_manager.get_batch_enrichment_prompt(bios)
+        
+        return [
+            self._system_msg,
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    def _parse_response(self, bio: str, raw_text: str) -> EnrichmentResult:
+        """
+        Parse raw model output into an EnrichmentResult
+        
+        Raises:
+            json.JSONDecodeError: If the response does not contain valid JSON
+        """
+        # Parse JSON (plain objects skip the markdown-fence handling entirely)
+        data = _json_loads(_extract_json(raw_text))
+        return self._result_from_data(bio, data, raw_text)
+    
+    def _parse_batch_response(self, bios: List[str], raw_text: str) -> List[EnrichmentResult]:
+        """
+        Parse the JSON array answering a numbered batch of bios
+        
+        Raises:
+            json.JSONDecodeError: If the response does not contain valid JSON
+            ValueError: If the array does not hold exactly one object per bio
+        """
+        items = _json_loads(_extract_json(raw_text))
+        
+        if not isinstance(items, list) or len(items) != len(bios) or \
+                not all(isinstance(item, dict) for item in items):
+            raise ValueError(f"Expected a JSON array of {len(bios)} objects")
+        
+        return [
+            self._result_from_data(bio, item, _json_dumps(item).decode())
+            for bio, item in zip(bios, items)
+        ]
+    
+    def _result_from_data(self, bio: str, data: Dict, raw_text: str) -> EnrichmentResult:
+        """Build a validated EnrichmentResult from one parsed JSON object"""
+        # Validate and normalize; skills must be a list of non-empty strings
+        skills = data.get('skills')
+        if not isinstance(skills, list):
+            skills = []
+        
+        result = EnrichmentResult(
+            skills=[skill.strip() for skill in skills if isinstance(skill, str) and skill.strip()],
+            persona=data.get('persona', 'Unknown'),
+            confidence_score=float(data.get('confidence_score', 0)) / 100.0,  # Normalize to 0-1
+            reasoning=data.get('reasoning', ''),
+            raw_response=raw_text
+        )
+        
+        # Validate confidence score
+        if not 0 <= result.confidence_score <= 1:
+            result.confidence_score = max(0, min(1, result.confidence_score))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Enriched bio: {bio[:50]}... -> Persona: {result.persona}, Confidence: {result.confidence_score:.2f}")
+        
+        return result
+    
+    def _cache_key(self, bio: str, prompt_version: str = PROMPT_VERSION) -> str:
+        """Content-addressed cache key for a bio under the current model and the given prompt"""
+        return hashlib.sha256(f"{self.model_name}|{prompt_version}|{bio}".encode()).hexdigest()
+    
+    def _get_cached(self, key: str) -> Optional[EnrichmentResult]:
+        """Look up a cached enrichment result"""
+        if self.cache is None or self.force_refresh:
+            return None
+        
+        blob = self.cache.get_cached_enrichment(key)
+        if not blob:
+            return None
+        
+        try:
+            return EnrichmentResult(**_json_loads(blob))
+        except (ValueError, TypeError) as e:
+            # Corrupt or schema-stale entry: treat as a miss; the fresh result replaces it
+            logger.warning(f"Ignoring unreadable cache entry {key[:12]}: {e}")
+            return None
+    
+    def _store_cached(self, key: str, result: EnrichmentResult):
+        """Cache a successfully parsed enrichment result"""
+        if self.cache is not None:
+            self.cache.cache_enrichment(key, _json_dumps(asdict(result)))
+    
+    def enrich_bio(self, bio: str, retry_count: int = 3) -> EnrichmentResult:
+        """
+        Enrich a single bio with AI analysis
+        
+        Args:
+            bio: Member bio/comment text
+            retry_count: Number of retries on failure
+        """
+        key = self._cache_key(bio)
+        cached = self._get_cached(key)
+        if cached:
+            return cached
+        
+        messages = self._build_messages(bio)
+        
+        for attempt in range(retry_count):
+            try:
+                raw_text = self._call_api(messages, retry_count=1)
+                result = self._parse_response(bio, raw_text)
+                self._store_cached(key, result)
                 return result
                 
             except json.JSONDecodeError as e:
@@ -265,35 +623,227 @@ class AIEnricher:
             raw_response=""
         )
     
-    def enrich_batch(self, bios: List[Dict], delay: float = 1.0) -> List[Dict]:
+    async def aenrich_bio(self, bio: str, retry_count: int = 3,
+                          rate_limiter: Optional[TokenBucket] = None) -> EnrichmentResult:
         """
-        Enrich multiple bios with rate limiting
+        Async variant of enrich_bio
+        
+        Args:
+            bio: Member bio/comment text
+            retry_count: Number of retries on failure
+            rate_limiter: Shared limiter to acquire from before each request
+        """
+        key = self._cache_key(bio)
+        cached = self._get_cached(key)
+        if cached:
+            return cached
+        
+        messages = self._build_messages(bio)
+        raw_text = ""
+        
+        for attempt in range(retry_count):
+            try:
+                raw_text = await self._acall_api(messages, retry_count=1, rate_limiter=rate_limiter)
+                result = self._parse_response(bio, raw_text)
+                self._store_cached(key, result)
+                return result
+                
+            except json.JSONDecodeError as e:
+                logger.warning(f"Attempt {attempt + 1}/{retry_count} - JSON parse error: {e}")
+                if attempt == retry_count - 1:
+                    # Return low-confidence fallback
+                    return EnrichmentResult(
+                        skills=[],
+                        persona="Unknown",
+                        confidence_score=0.0,
+                        reasoning="Failed to parse AI response",
+                        raw_response=raw_text
+                    )
+                await asyncio.sleep(1)
+                
+            except Exception as e:
+                logger.error(f"Attempt {attempt + 1}/{retry_count} - Enrichment error: {e}")
+                if attempt == retry_count - 1:
+                    return EnrichmentResult(
+                        skills=[],
+                        persona="Error",
+                        confidence_score=0.0,
+                        reasoning=f"Error: {str(e)}",
+                        raw_response=""
+                    )
+                await asyncio.sleep(1)
+        
+        # Should never reach here
+        return EnrichmentResult(
+            skills=[],
+            persona="Unknown",
+            confidence_score=0.0,
+            reasoning="Max retries exceeded",
+            raw_response=""
+        )
+    
+    def enrich_bios_batch(self, bios: List[str], retry_count: int = 3) -> List[EnrichmentResult]:
+        """
+        Enrich several bios with a single API request
+        
+        Bios with a cached batch result are skipped. If the response cannot be
+        matched up with the bios, each remaining bio is enriched individually
+        (and cached as a single-prompt result) instead.
+        
+        Args:
+            bios: Member bio/comment texts
+            retry_count: Number of retries on failure
+        """
+        keys = [self._cache_key(bio, BATCH_PROMPT_VERSION) for bio in bios]
+        results = [self._get_cached(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        pending_bios = [bios[i] for i in pending]
+        
+        batch = None
+        if len(pending) > 1:
+            try:
+                raw_text = self._call_api(self._build_batch_messages(pending_bios), retry_count=retry_count)
+                batch = self._parse_batch_response(pending_bios, raw_text)
+            except Exception as e:
+                logger.warning(f"Batch of {len(pending)} bios failed, enriching individually: {e}")
+        
+        if batch is None:
+            batch = [self.enrich_bio(bio, retry_count) for bio in pending_bios]
+        else:
+            for i, result in zip(pending, batch):
+                self._store_cached(keys[i], result)
+        
+        for i, result in zip(pending, batch):
+            results[i] = result
+        return results
+    
+    async def aenrich_bios_batch(self, bios: List[str], retry_count: int = 3,
+                                 rate_limiter: Optional[TokenBucket] = None) -> List[EnrichmentResult]:
+        """
+        Async variant of enrich_bios_batch
+        
+        Args:
+            bios: Member bio/comment texts
+            retry_count: Number of retries on failure
+            rate_limiter: Shared limiter to acquire from before each request
+        """
+        keys = [self._cache_key(bio, BATCH_PROMPT_VERSION) for bio in bios]
+        results = [self._get_cached(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        pending_bios = [bios[i] for i in pending]
+        
+        batch = None
+        if len(pending) > 1:
+            try:
+                raw_text = await self._acall_api(self._build_batch_messages(pending_bios),
+                                                 retry_count=retry_count, rate_limiter=rate_limiter)
+                batch = self._parse_batch_response(pending_bios, raw_text)
+            except Exception as e:
+                logger.warning(f"Batch of {len(pending)} bios failed, enriching individually: {e}")
+        
+        if batch is None:
+            # One request at a time: the caller holds a single concurrency slot for the whole batch
+            batch = [await self.aenrich_bio(bio, retry_count, rate_limiter) for bio in pending_bios]
+        else:
+            for i, result in zip(pending, batch):
+                self._store_cached(keys[i], result)
+        
+        for i, result in zip(pending, batch):
+            results[i] = result
+        return results
+    
+    async def aenrich_batch(self, bios: List[Dict], *, concurrency: int = 10,
+                            max_per_second: Optional[float] = 5.0,
+                            return_exceptions: bool = False, batch_size: int = 1) -> List:
+        """
+        Enrich multiple bios concurrently
         
         Args:
             bios: List of dicts with 'member_name' and 'bio_or_comment'
-            delay: Delay between API calls (seconds)
+            concurrency: Maximum number of requests in flight
+            max_per_second: Sustained request rate; bursts up to `concurrency` (None for no limit)
+            return_exceptions: Return a failed record's exception in its slot instead of raising
+            batch_size: Number of bios sent per request
         """
-        enriched = []
+        self._get_async_client(max_connections=concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_limiter = TokenBucket(max_per_second, burst=concurrency) if max_per_second else None
+        completed = 0
         
-        for i, record in enumerate(bios):
-            logger.info(f"Enriching {i+1}/{len(bios)}: {record['member_name']}")
+        async def enrich_group(start: int, records: List[Dict]) -> List[Dict]:
+            nonlocal completed
             
-            result = self.enrich_bio(record['bio_or_comment'])
+            async with semaphore:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Enriching {start+1}-{start+len(records)}/{len(bios)}: "
+                                 f"{', '.join(record['member_name'] for record in records)}")
+                if len(records) == 1:
+                    results = [await self.aenrich_bio(records[0]['bio_or_comment'], rate_limiter=rate_limiter)]
+                else:
+                    results = await self.aenrich_bios_batch(
+                        [record['bio_or_comment'] for record in records], rate_limiter=rate_limiter
+                    )
             
-            enriched.append({
-                'member_name': record['member_name'],
-                'skills': result.skills,
-                'persona': result.persona,
-                'confidence_score': result.confidence_score,
-                'reasoning': result.reasoning,
-                'raw_response': result.raw_response
-            })
+            # Progress every 100 records rather than per record
+            previous, completed = completed, completed + len(records)
+            if completed // 100 > previous // 100 or completed == len(bios):
+                logger.info(f"Enriched {completed}/{len(bios)}")
             
-            # Rate limiting
-            if i < len(bios) - 1:
-                time.sleep(delay)
+            return [
+                {
+                    'member_name': record['member_name'],
+                    'skills': result.skills,
+                    'persona': result.persona,
+                    'confidence_score': result.confidence_score,
+                    'reasoning': result.reasoning,
+                    'raw_response': result.raw_response
+                }
+                for record, result in zip(records, results)
+            ]
+        
+        groups = [bios[i:i + batch_size] for i in range(0, len(bios), batch_size)]
+        outcomes = await asyncio.gather(
+            *(enrich_group(i * batch_size, group) for i, group in enumerate(groups)),
+            return_exceptions=return_exceptions
+        )
+        
+        # A failed group fills every one of its records' slots with the exception
+        results = []
+        for group, outcome in zip(groups, outcomes):
+            results.extend([outcome] * len(group) if isinstance(outcome, BaseException) else outcome)
+        return results
+    
+    def enrich_batch(self, bios: List[Dict], delay: Optional[float] = None, *,
+                     concurrency: int = 10, max_per_second: Optional[float] = 5.0,
+                     return_exceptions: bool = False, batch_size: int = 1) -> List:
+        """
+        Enrich multiple bios with bounded concurrency and rate limiting
+        
+        Synchronous wrapper around aenrich_batch.
+        
+        Args:
+            bios: List of dicts with 'member_name' and 'bio_or_comment'
+            delay: Deprecated; seconds between API calls, mapped to max_per_second=1/delay
+            concurrency: Maximum number of requests in flight
+            max_per_second: Sustained request rate; bursts up to `concurrency` (None for no limit)
+            return_exceptions: Return a failed record's exception in its slot instead of raising
+            batch_size: Number of bios sent per request
+        """
+        if delay is not None:
+            warnings.warn("enrich_batch(delay=...) is deprecated; use max_per_second instead",
+                          DeprecationWarning, stacklevel=2)
+            max_per_second = 1 / delay if delay > 0 else None
+        
+        async def run() -> List:
+            try:
+                return await self.aenrich_batch(bios, concurrency=concurrency,
+                                                max_per_second=max_per_second,
+                                                return_exceptions=return_exceptions,
+                                                batch_size=batch_size)
+            finally:
+                await self.aclose()
         
-        return enriched
+        return asyncio.run(run())
     
     def __del__(self):
         """Cleanup HTTP client"""
@@ -1,11 +1,93 @@
 import sqlite3
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from datetime import datetime
 import json
 
 logger = logging.getLogger(__name__)
 
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Apply per-connection tuning PRAGMAs and return the connection
+    
+    WAL journaling appends commits to a log instead of rewriting pages, so the
+    query CLI and dashboard can read while the pipeline writes. With
+    synchronous=NORMAL the WAL is only fsynced at checkpoints: a power loss can
+    drop the most recent commits but cannot corrupt the database. The 64 MiB page
+    cache and 256 MiB memory map keep hot pages in RAM and avoid read() syscalls,
+    at the cost of that much memory/address space per open connection.
+    """
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MiB page cache
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    conn.execute('PRAGMA foreign_keys=ON')
+    return conn
+
+
+# Every summary statistic in one pass, as (kind, label, count, avg_confidence) rows:
+#   persona: one row per current persona type
+#   current: all current personas (count is the number below the confidence threshold)
+#   members: total member count
+#   skill:   the ten most common skills
+SUMMARY_QUERY = '''
+    WITH current AS (
+        SELECT persona_type, confidence_score
+        FROM member_personas
+        WHERE is_current = 1
+    )
+    SELECT 'persona' AS kind, persona_type AS label, COUNT(*) AS count, AVG(confidence_score) AS avg_conf
+    FROM current
+    GROUP BY persona_type
+    UNION ALL
+    SELECT 'current', NULL, COALESCE(SUM(confidence_score < ?), 0), AVG(confidence_score)
+    FROM current
+    UNION ALL
+    SELECT 'members', NULL, COUNT(*), NULL
+    FROM members
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'skill', s.skill_name, COUNT(*) AS count, NULL
+        FROM member_skills ms
+        JOIN skills s ON ms.skill_id = s.skill_id
+        GROUP BY s.skill_name
+        ORDER BY count DESC
+        LIMIT 10
+    )
+    ORDER BY kind, count DESC
+'''
+
+
+def fetch_summary(conn: sqlite3.Connection, low_confidence_threshold: float = 0.5) -> Dict:
+    """
+    Collect database summary statistics with a single aggregate query
+    
+    Returns:
+        Dict with total_members, persona_distribution (persona -> (count, avg confidence)),
+        average_confidence, low_confidence_count and top_skills (skill -> count)
+    """
+    summary = {
+        'total_members': 0,
+        'persona_distribution': {},
+        'average_confidence': None,
+        'low_confidence_count': 0,
+        'top_skills': {}
+    }
+    
+    for kind, label, count, avg_conf in conn.execute(SUMMARY_QUERY, (low_confidence_threshold,)):
+        if kind == 'persona':
+            summary['persona_distribution'][label] = (count, avg_conf)
+        elif kind == 'skill':
+            summary['top_skills'][label] = count
+        elif kind == 'current':
+            summary['low_confidence_count'] = count
+            summary['average_confidence'] = avg_conf
+        elif kind == 'members':
+            summary['total_members'] = count
+    
+    return summary
+
 
 class DatabaseManager:
     """Manages SQLite database operations"""
@@ -13,12 +95,13 @@ class DatabaseManager:
     def __init__(self, db_path: str = 'volunteer_data.db'):
         self.db_path = db_path
         self.conn = None
+        self._skill_cache: Optional[Dict[str, int]] = None  # skill_name -> skill_id
         self.init_database()
     
     def get_connection(self) -> sqlite3.Connection:
         """Get database connection"""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = configure_connection(sqlite3.connect(self.db_path))
             self.conn.row_factory = sqlite3.Row
         return self.conn
     
@@ -106,20 +189,85 @@ class DatabaseManager:
             )
         ''')
         
+        # Cache of AI enrichment results, keyed by hash of model, prompt version and bio
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bio_cache (
+                key TEXT PRIMARY KEY,
+                result BLOB NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        
         # Indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_members_active_date ON members(last_active_date)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_personas_current ON member_personas(is_current, member_id)')
+        # Covers the current-persona filters and the member_id join without touching the table
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_personas_current_type_conf ON member_personas(is_current, persona_type, confidence_score DESC, member_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_skills_name ON skills(skill_name)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_member_skills_skill ON member_skills(skill_id, member_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_processing_status ON processing_log(status, timestamp)')
         
+        self._init_member_search(cursor)
+        
         conn.commit()
         logger.info("Database initialized successfully")
     
-    def insert_member(self, name: str, bio: str, last_active_date: Optional[str], raw_date: str) -> int:
+    def _init_member_search(self, cursor: sqlite3.Cursor):
+        """
+        Create the members_fts full-text index over member names and bios
+        
+        The trigram tokenizer answers the same case-insensitive substring searches
+        as LIKE '%term%' from an index. Triggers keep it in sync with members.
+        Skipped when this SQLite build lacks FTS5 or trigram support; searches
+        then fall back to LIKE.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'members_fts'"
+        ).fetchone()
+        if exists:
+            return
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE members_fts USING fts5(
+                    member_name, bio_or_comment,
+                    content='members', content_rowid='member_id', tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text member search unavailable, using LIKE: {e}")
+            return
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_insert AFTER INSERT ON members BEGIN
+                INSERT INTO members_fts (rowid, member_name, bio_or_comment)
+                VALUES (new.member_id, new.member_name, new.bio_or_comment);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_delete AFTER DELETE ON members BEGIN
+                INSERT INTO members_fts (members_fts, rowid, member_name, bio_or_comment)
+                VALUES ('delete', old.member_id, old.member_name, old.bio_or_comment);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_update AFTER UPDATE OF member_name, bio_or_comment ON members BEGIN
+                INSERT INTO members_fts (members_fts, rowid, member_name, bio_or_comment)
+                VALUES ('delete', old.member_id, old.member_name, old.bio_or_comment);
+                INSERT INTO members_fts (rowid, member_name, bio_or_comment)
+                VALUES (new.member_id, new.member_name, new.bio_or_comment);
+            END
+        ''')
+        
+        # Index members that existed before the search table was added
+        cursor.execute("INSERT INTO members_fts (members_fts) VALUES ('rebuild')")
+    
+    def insert_member(self, name: str, bio: str, last_active_date: Optional[str], raw_date: str,
+                      now: Optional[str] = None) -> int:
         """Insert or update a member record"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        now = datetime.now().isoformat()
+        now = now or datetime.now().isoformat()
         
         try:
             cursor.execute('''
@@ -144,35 +292,135 @@ class DatabaseManager:
             conn.rollback()
             raise
     
-    def get_or_create_skill(self, skill_name: str, category: Optional[str] = None) -> int:
+    def insert_members_bulk(self, records: List[tuple], now: Optional[str] = None) -> Dict[str, int]:
+        """
+        Insert or update many member records in a single transaction
+        
+        Args:
+            records: (name, bio, last_active_date, raw_date) tuples
+            now: Timestamp shared by the whole batch (defaults to the current time)
+            
+        Returns:
+            Mapping of member_name to member_id
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = now or datetime.now().isoformat()
+        
+        rows = [(name, bio, last_active_date, raw_date, now, now)
+                for name, bio, last_active_date, raw_date in records]
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany('''
+                INSERT INTO members (member_name, bio_or_comment, last_active_date, raw_date, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(member_name) DO UPDATE SET
+                    bio_or_comment = excluded.bio_or_comment,
+                    last_active_date = excluded.last_active_date,
+                    raw_date = excluded.raw_date,
+                    updated_at = excluded.updated_at
+            ''', rows)
+            
+            member_ids = {
+                row['member_name']: row['member_id']
+                for row in self._select_in(
+                    cursor,
+                    'SELECT member_id, member_name FROM members WHERE member_name IN ({placeholders})',
+                    [row[0] for row in rows]
+                )
+            }
+            
+            conn.commit()
+            return member_ids
+            
+        except Exception as e:
+            logger.error(f"Error bulk inserting {len(rows)} members: {e}")
+            conn.rollback()
+            raise
+    
+    def get_or_create_skill(self, skill_name: str, category: Optional[str] = None,
+                            now: Optional[str] = None) -> int:
         """Get skill_id or create if doesn't exist"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         skill_name = skill_name.strip().lower()
         
+        if self._skill_cache and skill_name in self._skill_cache:
+            return self._skill_cache[skill_name]
+        
         cursor.execute('SELECT skill_id FROM skills WHERE skill_name = ?', (skill_name,))
         row = cursor.fetchone()
         
         if row:
+            if self._skill_cache is not None:
+                self._skill_cache[skill_name] = row[0]
             return row[0]
         
         # Create new skill
-        now = datetime.now().isoformat()
+        now = now or datetime.now().isoformat()
         cursor.execute('''
             INSERT INTO skills (skill_name, category, created_at)
             VALUES (?, ?, ?)
         ''', (skill_name, category, now))
         
         conn.commit()
+        if self._skill_cache is not None:
+            self._skill_cache[skill_name] = cursor.lastrowid
         return cursor.lastrowid
     
+    def resolve_skills(self, names: Set[str], now: Optional[str] = None) -> Dict[str, int]:
+        """
+        Map skill names to skill_ids, creating any that don't exist yet
+        
+        Known skills are served from an in-memory cache; misses are inserted
+        with a single executemany and fetched back with one chunked query.
+        Joins the caller's transaction if one is open, otherwise commits.
+        
+        Args:
+            names: Skill names (normalized to stripped lowercase)
+            now: Creation timestamp for new skills (defaults to the current time)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        owns_transaction = not conn.in_transaction
+        
+        if self._skill_cache is None:
+            self._skill_cache = {
+                row['skill_name']: row['skill_id']
+                for row in cursor.execute('SELECT skill_id, skill_name FROM skills')
+            }
+        
+        names = {name.strip().lower() for name in names if name.strip()}
+        missing = sorted(names - self._skill_cache.keys())
+        
+        if missing:
+            now = now or datetime.now().isoformat()
+            cursor.executemany('''
+                INSERT OR IGNORE INTO skills (skill_name, category, created_at)
+                VALUES (?, NULL, ?)
+            ''', [(skill_name, now) for skill_name in missing])
+            
+            for row in self._select_in(
+                cursor,
+                'SELECT skill_id, skill_name FROM skills WHERE skill_name IN ({placeholders})',
+                missing
+            ):
+                self._skill_cache[row['skill_name']] = row['skill_id']
+            
+            if owns_transaction:
+                conn.commit()
+        
+        return {name: self._skill_cache[name] for name in names}
+    
     def insert_enrichment(self, member_id: int, skills: List[str], persona: str, 
-                         confidence: float, reasoning: str, version: int):
+                         confidence: float, reasoning: str, version: int,
+                         now: Optional[str] = None):
         """Insert enrichment data for a member"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        now = datetime.now().isoformat()
+        now = now or datetime.now().isoformat()
         
         try:
             # Mark previous personas as not current
@@ -189,43 +437,144 @@ class DatabaseManager:
             ''', (member_id, persona, confidence, reasoning, version, now))
             
             # Insert skills
-            for skill_name in skills:
-                if skill_name.strip():
-                    skill_id = self.get_or_create_skill(skill_name)
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO member_skills (member_id, skill_id, enrichment_version, confidence, created_at)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (member_id, skill_id, version, confidence, now))
+            skill_ids = self.resolve_skills(set(skills), now)
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO member_skills (member_id, skill_id, enrichment_version, confidence, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(member_id, skill_id, version, confidence, now) for skill_id in skill_ids.values()])
             
             conn.commit()
             
         except Exception as e:
             logger.error(f"Error inserting enrichment for member_id {member_id}: {e}")
             conn.rollback()
+            # Skills created inside the rolled-back transaction no longer exist
+            self._skill_cache = None
             raise
     
+    def insert_enrichments_bulk(self, enrichments: List[Dict], version: int,
+                                now: Optional[str] = None):
+        """
+        Insert enrichment data for many members in a single transaction
+        
+        Args:
+            enrichments: Dicts with member_id, skills, persona, confidence and reasoning
+            version: Enrichment version (run id)
+            now: Timestamp shared by the whole batch (defaults to the current time)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = now or datetime.now().isoformat()
+        
+        # A member listed twice keeps only its last result, as sequential
+        # insert_enrichment calls would leave it with one current persona
+        enrichments = list({e['member_id']: e for e in enrichments}.values())
+        
+        try:
+            # Normalized skill names per enrichment, deduplicated up front
+            member_skills = [
+                {name.strip().lower() for name in enrichment['skills'] if name.strip()}
+                for enrichment in enrichments
+            ]
+            all_skills = set().union(*member_skills)
+            
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            # Mark previous personas as not current
+            cursor.executemany('''
+                UPDATE member_personas 
+                SET is_current = 0 
+                WHERE member_id = ? AND is_current = 1
+            ''', [(enrichment['member_id'],) for enrichment in enrichments])
+            
+            # Insert new personas
+            cursor.executemany('''
+                INSERT INTO member_personas (member_id, persona_type, confidence_score, reasoning, enrichment_version, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (e['member_id'], e['persona'], e['confidence'], e['reasoning'], version, now)
+                for e in enrichments
+            ])
+            
+            # Create any new skills and map every name to its id in one pass
+            skill_ids = self.resolve_skills(all_skills, now)
+            
+            cursor.executemany('''
+                INSERT OR REPLACE INTO member_skills (member_id, skill_id, enrichment_version, confidence, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                (e['member_id'], skill_ids[skill_name], version, e['confidence'], now)
+                for e, skills in zip(enrichments, member_skills)
+                for skill_name in skills
+            ])
+            
+            conn.commit()
+            
+        except Exception as e:
+            logger.error(f"Error bulk inserting enrichment for {len(enrichments)} members: {e}")
+            conn.rollback()
+            # Skills created inside the rolled-back transaction no longer exist
+            self._skill_cache = None
+            raise
+    
+    @staticmethod
+    def _select_in(cursor: sqlite3.Cursor, query: str, values: List) -> List[sqlite3.Row]:
+        """Run a SELECT with an IN ({placeholders}) clause, chunked to stay under SQLite's variable limit"""
+        rows = []
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            placeholders = ','.join('?' for _ in chunk)
+            rows.extend(cursor.execute(query.format(placeholders=placeholders), chunk).fetchall())
+        return rows
+    
     def log_processing(self, member_id: Optional[int], member_name: str, stage: str, 
-                      status: str, error_msg: Optional[str] = None):
+                      status: str, error_msg: Optional[str] = None, now: Optional[str] = None):
         """Log processing status"""
         conn = self.get_connection()
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
+        now = now or datetime.now().isoformat()
         
-        cursor.execute('''
+        conn.execute('''
             INSERT INTO processing_log (member_id, member_name, processing_stage, status, error_message, timestamp)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', (member_id, member_name, stage, status, error_msg, now))
         
         conn.commit()
     
+    def log_processing_many(self, entries: List[tuple], now: Optional[str] = None):
+        """
+        Log processing status for many members in a single transaction
+        
+        Args:
+            entries: (member_id, member_name, stage, status, error_msg) tuples
+            now: Timestamp shared by the whole batch (defaults to the current time)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        now = now or datetime.now().isoformat()
+        
+        rows = [(member_id, member_name, stage, status, error_msg, now)
+                for member_id, member_name, stage, status, error_msg in entries]
+        
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany('''
+                INSERT INTO processing_log (member_id, member_name, processing_stage, status, error_message, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+            
+        except Exception as e:
+            logger.error(f"Error logging processing status for {len(rows)} members: {e}")
+            conn.rollback()
+            raise
+    
     def create_enrichment_run(self, model_name: str, prompt_version: str) -> int:
         """Create a new enrichment run record"""
         conn = self.get_connection()
-        cursor = conn.cursor()
         now = datetime.now().isoformat()
         
-        cursor.execute('''
+        cursor = conn.execute('''
             INSERT INTO enrichment_runs (run_timestamp, model_name, prompt_version, status)
             VALUES (?, ?, ?, ?)
         ''', (now, model_name, prompt_version, 'in_progress'))
@@ -236,9 +585,8 @@ class DatabaseManager:
     def update_enrichment_run(self, run_id: int, records_processed: int, status: str, notes: Optional[str] = None):
         """Update enrichment run status"""
         conn = self.get_connection()
-        cursor = conn.cursor()
         
-        cursor.execute('''
+        conn.execute('''
             UPDATE enrichment_runs
             SET records_processed = ?, status = ?, notes = ?
             WHERE run_id = ?
@@ -246,6 +594,30 @@ class DatabaseManager:
         
         conn.commit()
     
+    def get_cached_enrichment(self, key: str) -> Optional[bytes]:
+        """Get a cached enrichment result blob, or None on a miss"""
+        conn = self.get_connection()
+        row = conn.execute('SELECT result FROM bio_cache WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+    
+    def cache_enrichment(self, key: str, result: bytes):
+        """Store an enrichment result blob in the cache"""
+        conn = self.get_connection()
+        now = datetime.now().isoformat()
+        
+        conn.execute('''
+            INSERT OR REPLACE INTO bio_cache (key, result, created_at)
+            VALUES (?, ?, ?)
+        ''', (key, result, now))
+        
+        conn.commit()
+    
+    def analyze(self):
+        """Refresh the query planner's table statistics; run once after a bulk load"""
+        conn = self.get_connection()
+        conn.execute('ANALYZE')
+        conn.commit()
+    
     def close(self):
         """Close database connection"""
         if self.conn:
@@ -1,7 +1,39 @@
 import os
+import sys
+import itertools
 import httpx
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _provider(model):
+    """Provider prefix of a model id ('unknown' when there is none)"""
+    model_id = model.get("id", "")
+    return model_id.split("/")[0] if "/" in model_id else "unknown"
+
+
+def format_model(model):
+    """Format a single model entry as a list of output lines"""
+    model_id = model.get("id", "")
+    name = model.get("name", model_id)
+    context_length = model.get("context_length", "N/A")
+    pricing = model.get("pricing", {})
+    
+    lines = [f"  ✓ {model_id}", f"    Name: {name}"]
+    if context_length != "N/A":
+        lines.append(f"    Context: {context_length:,} tokens")
+    if pricing:
+        prompt_price = pricing.get("prompt", "N/A")
+        completion_price = pricing.get("completion", "N/A")
+        lines.append(f"    Pricing: ${prompt_price}/1M prompt, ${completion_price}/1M completion")
+    lines.append("")
+    return lines
+
+
 # Get API key
 api_key = os.getenv('OPENROUTER_API_KEY')
 if not api_key:
@@ -19,47 +51,27 @@ try:
     with httpx.Client(timeout=30.0, headers=headers) as client:
         response = client.get("https://openrouter.ai/api/v1/models")
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content) if orjson else response.json()
         
         models = data.get("data", [])
         
-        print("Available models:")
-        print("-" * 80)
-        
-        # Group by provider
-        providers = {}
-        for model in models:
-            provider = model.get("id", "").split("/")[0] if "/" in model.get("id", "") else "unknown"
-            if provider not in providers:
-                providers[provider] = []
-            providers[provider].append(model)
+        # Sort once by (provider, id) so each provider is a contiguous run
+        models.sort(key=lambda m: (_provider(m), m.get("id", "")))
         
-        # Print models grouped by provider
-        for provider in sorted(providers.keys()):
-            print(f"\n{provider.upper()}:")
-            for model in sorted(providers[provider], key=lambda x: x.get("id", "")):
-                model_id = model.get("id", "")
-                name = model.get("name", model_id)
-                context_length = model.get("context_length", "N/A")
-                pricing = model.get("pricing", {})
-                
-                print(f"  ✓ {model_id}")
-                print(f"    Name: {name}")
-                if context_length != "N/A":
-                    print(f"    Context: {context_length:,} tokens")
-                if pricing:
-                    prompt_price = pricing.get("prompt", "N/A")
-                    completion_price = pricing.get("completion", "N/A")
-                    print(f"    Pricing: ${prompt_price}/1M prompt, ${completion_price}/1M completion")
-                print()
+        lines = ["Available models:", "-" * 80]
+        for provider, group in itertools.groupby(models, key=_provider):
+            lines.append(f"\n{provider.upper()}:")
+            for model in group:
+                lines.extend(format_model(model))
         
-        print("-" * 80)
-        print("\nRecommended models to use:")
-        print("  - openai/gpt-4o-mini (cost-effective, fast)")
-        print("  - openai/gpt-4o (better quality)")
-        print("  - anthropic/claude-3-haiku (fast, good quality)")
-        print("  - google/gemini-2.0-flash-exp (latest Gemini)")
-        print("\nNote: You can use any model ID from the list above in your code.")
+        lines.append("-" * 80)
+        lines.append("\nRecommended models to use:")
+        lines.append("  - openai/gpt-4o-mini (cost-effective, fast)")
+        lines.append("  - openai/gpt-4o (better quality)")
+        lines.append("  - anthropic/claude-3-haiku (fast, good quality)")
+        lines.append("  - google/gemini-2.0-flash-exp (latest Gemini)")
+        lines.append("\nNote: You can use any model ID from the list above in your code.")
+        sys.stdout.write("\n".join(lines) + "\n")
         
 except httpx.HTTPStatusError as e:
     print(f"Error: {e.response.status_code} - {e.response.text}")
@@ -1,12 +1,19 @@
+import numpy as np
 import pandas as pd
 import sqlite3
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import re
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON serialization
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,6 +26,70 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Columns read from the input CSV (after header normalization)
+REQUIRED_COLUMNS = ('member_name', 'bio_or_comment', 'last_active_date')
+
+# Supported input date formats, in the order they are tried
+DATE_FORMATS = [
+    '%Y-%m-%d',      # 2024-06-12
+    '%d/%m/%y',      # 12/05/24
+    '%Y/%m/%d',      # 2024/06/12
+    '%d-%m-%Y',      # 12-05-2024
+    '%Y.%m.%d',      # 2024.02.14
+    '%b %d %Y',      # Jan 7 2024
+    '%d-%m-%y',      # 15-02-24
+]
+
+# (length, separator index, separator) -> the only format that can match that shape
+_DATE_FORMATS_BY_SHAPE = {
+    (10, 4, '-'): '%Y-%m-%d',
+    (10, 4, '/'): '%Y/%m/%d',
+    (10, 4, '.'): '%Y.%m.%d',
+    (10, 2, '-'): '%d-%m-%Y',
+    (8, 2, '/'): '%d/%m/%y',
+    (8, 2, '-'): '%d-%m-%y',
+}
+
+
+def _date_format_for(date_str: str) -> Optional[str]:
+    """Pick the single candidate format for a date string from its shape"""
+    if date_str[:1].isalpha():
+        return '%b %d %Y'
+    
+    for sep_index in (2, 4):
+        if len(date_str) > sep_index and not date_str[sep_index].isdigit():
+            return _DATE_FORMATS_BY_SHAPE.get((len(date_str), sep_index, date_str[sep_index]))
+    
+    return None
+
+
+def _iso_date(value: datetime) -> str:
+    """Format as YYYY-MM-DD without going through strftime's format interpreter"""
+    return f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> Optional[str]:
+    """Parse a stripped date string to ISO format, or None if no format matches"""
+    fmt = _date_format_for(date_str)
+    if fmt:
+        try:
+            return _iso_date(datetime.strptime(date_str, fmt))
+        except ValueError:
+            pass
+    
+    # Unrecognised shape: try every format
+    for fmt in DATE_FORMATS:
+        try:
+            parsed_date = datetime.strptime(date_str, fmt)
+            return _iso_date(parsed_date)
+        except ValueError:
+            continue
+    
+    logger.warning(f"Could not parse date: {date_str}")
+    return None
+
+
 class DataNormalizer:
     """Handles data validation and normalization"""
     
@@ -38,42 +109,7 @@ class DataNormalizer:
         if pd.isna(date_str) or not date_str:
             return None
         
-        date_str = str(date_str).strip()
-        
-        # Try multiple date formats
-        formats = [
-            '%Y-%m-%d',      # 2024-06-12
-            '%d/%m/%y',      # 12/05/24
-            '%Y/%m/%d',      # 2024/06/12
-            '%d-%m-%Y',      # 12-05-2024
-            '%Y.%m.%d',      # 2024.02.14
-            '%b %d %Y',      # Jan 7 2024
-            '%d-%m-%y',      # 15-02-2024
-        ]
-        
-        for fmt in formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                return parsed_date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        logger.warning(f"Could not parse date: {date_str}")
-        return None
-    
-    @staticmethod
-    def validate_record(row: pd.Series) -> tuple[bool, str]:
-        """
-        Validate a single record
-        Returns (is_valid, error_message)
-        """
-        if pd.isna(row.get('member_name')):
-            return False, "Missing member name"
-        
-        if pd.isna(row.get('bio_or_comment')):
-            return False, "Missing bio/comment"
-        
-        return True, ""
+        return _parse_date(str(date_str).strip())
 
 
 class CSVIngester:
@@ -84,63 +120,99 @@ class CSVIngester:
         self.normalizer = DataNormalizer()
         self.errors = []
     
-    def load_and_validate(self) -> pd.DataFrame:
-        """Load CSV and perform initial validation"""
-        logger.info(f"Loading CSV from {self.csv_path}")
+    def iter_chunks(self, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the CSV in chunks, yielding each one normalized
+        
+        Peak memory is bounded by the chunk size rather than the file size.
+        Validation errors are collected across chunks and saved once the
+        stream is exhausted.
+        """
+        logger.info(f"Streaming CSV from {self.csv_path} in chunks of {chunksize}")
         
         try:
-            df = pd.read_csv(self.csv_path)
-            logger.info(f"Loaded {len(df)} records")
+            reader = pd.read_csv(
+                self.csv_path,
+                chunksize=chunksize,
+                usecols=lambda col: col.strip().lower() in REQUIRED_COLUMNS,
+                dtype='string',
+                engine='c'
+            )
         except Exception as e:
             logger.error(f"Failed to load CSV: {e}")
             raise
         
-        # Normalize column names
-        df.columns = df.columns.str.strip().str.lower()
+        processed_count = 0
+        
+        for chunk in reader:
+            # Normalize column names
+            chunk.columns = chunk.columns.str.strip().str.lower()
+            # Absent columns become all-NA and go through the usual invalid-row handling
+            chunk = chunk.reindex(columns=list(REQUIRED_COLUMNS)).astype('string')
+            
+            processed = self._normalize_chunk(chunk)
+            processed_count += len(processed)
+            yield processed
+        
+        logger.info(f"Successfully processed {processed_count} records")
+        logger.info(f"Failed to process {len(self.errors)} records")
         
-        return df
+        # Save errors to file
+        if self.errors:
+            if orjson:
+                with open('processing_errors.json', 'wb') as f:
+                    f.write(orjson.dumps(self.errors, option=orjson.OPT_INDENT_2))
+            else:
+                with open('processing_errors.json', 'w') as f:
+                    json.dump(self.errors, f, indent=2)
+            logger.info("Saved processing errors to processing_errors.json")
     
     def process(self) -> pd.DataFrame:
         """Process and normalize the data"""
-        df = self.load_and_validate()
+        chunks = list(self.iter_chunks())
         
-        processed_records = []
+        if not chunks:
+            return pd.DataFrame()
         
-        for idx, row in df.iterrows():
-            # Validate record
-            is_valid, error_msg = self.normalizer.validate_record(row)
+        return pd.concat(chunks, ignore_index=True)
+    
+    def _normalize_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validate and normalize one chunk, recording invalid rows in self.errors"""
+        # Validate records
+        missing_name = df['member_name'].isna()
+        missing_bio = df['bio_or_comment'].isna()
+        invalid_mask = missing_name | missing_bio
+        
+        if invalid_mask.any():
+            invalid = df[invalid_mask].astype(object)
+            invalid = invalid.where(invalid.notna(), None)
+            error_msgs = np.where(missing_name[invalid_mask], "Missing member name", "Missing bio/comment")
             
-            if not is_valid:
+            for idx, error_msg, raw_data in zip(invalid.index.tolist(), error_msgs.tolist(),
+                                                invalid.to_dict('records')):
                 self.errors.append({
                     'row_index': idx,
                     'error': error_msg,
-                    'raw_data': row.to_dict()
+                    'raw_data': raw_data
                 })
                 logger.warning(f"Row {idx} validation failed: {error_msg}")
-                continue
-            
-            # Normalize data
-            processed_record = {
-                'member_name': self.normalizer.normalize_name(row['member_name']),
-                'bio_or_comment': str(row['bio_or_comment']).strip(),
-                'last_active_date': self.normalizer.normalize_date(row.get('last_active_date')),
-                'raw_date': str(row.get('last_active_date', '')),
-                'ingestion_timestamp': datetime.now().isoformat(),
-                'processing_status': 'normalized'
-            }
-            
-            processed_records.append(processed_record)
         
-        logger.info(f"Successfully processed {len(processed_records)} records")
-        logger.info(f"Failed to process {len(self.errors)} records")
+        valid = df[~invalid_mask]
+        raw_dates = valid['last_active_date']
         
-        # Save errors to file
-        if self.errors:
-            with open('processing_errors.json', 'w') as f:
-                json.dump(self.errors, f, indent=2)
-            logger.info("Saved processing errors to processing_errors.json")
+        # Parse each distinct date once, then map the results back onto the column
+        date_lookup = {raw: self.normalizer.normalize_date(raw) for raw in raw_dates.dropna().unique()}
+        last_active_dates = raw_dates.astype(object).map(date_lookup)
         
-        return pd.DataFrame(processed_records)
+        # Normalize data
+        return pd.DataFrame({
+            'member_name': valid['member_name'].str.title().str.split().str.join(' '),
+            'bio_or_comment': valid['bio_or_comment'].str.strip(),
+            'last_active_date': last_active_dates.astype(object).where(last_active_dates.notna(), None),
+            'raw_date': raw_dates.fillna(''),
+            'ingestion_timestamp': datetime.now().isoformat(),
+            'processing_status': pd.Categorical(['normalized'] * len(valid), categories=['normalized'])
+        }).reset_index(drop=True)
 
 
 if __name__ == "__main__":
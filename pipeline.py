@@ -1,13 +1,15 @@
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import pandas as pd
 
 # Import our modules
 from main import CSVIngester
-from ai_enrichment import AIEnricher
-from database import DatabaseManager
+from ai_enrichment import AIEnricher, PROMPT_VERSION
+from database import DatabaseManager, fetch_summary
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,11 +22,33 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _prefetch(items: Iterable) -> Iterator:
+    """
+    Yield from an iterable while producing the next item in a background thread
+
+    Lets CSV parsing of the next chunk overlap with the database insert of the
+    current one; at most one item is buffered ahead.
+    """
+    iterator = iter(items)
+    done = object()
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, done)
+        while True:
+            item = future.result()
+            if item is done:
+                return
+            future = executor.submit(next, iterator, done)
+            yield item
+
+
 class VolunteerPipeline:
     """Orchestrates the complete volunteer data pipeline"""
     
     def __init__(self, csv_path: str, db_path: str = 'volunteer_data.db', 
-                 api_key: Optional[str] = None):
+                 api_key: Optional[str] = None, force_refresh: bool = False,
+                 concurrency: int = 10, max_per_second: Optional[float] = 5.0,
+                 batch_size: int = 10):
         """
         Initialize pipeline
         
@@ -32,10 +56,18 @@ class VolunteerPipeline:
             csv_path: Path to input CSV file
             db_path: Path to SQLite database
             api_key: OpenRouter API key (or use OPENROUTER_API_KEY env var)
+            force_refresh: Re-enrich every bio instead of reusing cached results
+            concurrency: Maximum number of enrichment requests in flight
+            max_per_second: Sustained enrichment request rate (None for no limit)
+            batch_size: Number of bios sent per enrichment request
         """
         self.csv_path = csv_path
         self.db_path = db_path
         self.api_key = api_key
+        self.force_refresh = force_refresh
+        self.concurrency = concurrency
+        self.max_per_second = max_per_second
+        self.batch_size = batch_size
         
         logger.info("Initializing Volunteer Pipeline")
         logger.info(f"CSV: {csv_path}")
@@ -47,16 +79,10 @@ class VolunteerPipeline:
         logger.info("STARTING VOLUNTEER PIPELINE")
         logger.info("=" * 80)
         
-        # Step 1: Ingest and normalize
+        # Step 1: Ingest and normalize (streamed chunk by chunk into Step 3)
         logger.info("\n[STEP 1] Ingesting and normalizing CSV data...")
         ingester = CSVIngester(self.csv_path)
-        df = ingester.process()
-        
-        if len(df) == 0:
-            logger.error("No valid records to process. Exiting.")
-            return
-        
-        logger.info(f"✓ Successfully normalized {len(df)} records")
+        chunks = _prefetch(ingester.iter_chunks())
         
         # Step 2: Initialize database
         logger.info("\n[STEP 2] Initializing database...")
@@ -66,38 +92,39 @@ class VolunteerPipeline:
         # Step 3: Load members into database
         logger.info("\n[STEP 3] Loading members into database...")
         member_records = []
+        log_entries = []
         
-        for _, row in df.iterrows():
+        for chunk in chunks:
+            names = chunk['member_name'].tolist()
+            now = datetime.now().isoformat()
+            
             try:
-                member_id = db.insert_member(
-                    name=row['member_name'],
-                    bio=row['bio_or_comment'],
-                    last_active_date=row['last_active_date'],
-                    raw_date=row['raw_date']
+                member_ids = db.insert_members_bulk(
+                    chunk[['member_name', 'bio_or_comment', 'last_active_date', 'raw_date']]
+                    .itertuples(index=False, name=None),
+                    now=now
                 )
-                
+            except Exception as e:
+                logger.error(f"Failed to insert chunk of {len(chunk)} members: {e}")
+                log_entries.extend((None, name, 'ingestion', 'error', str(e)) for name in names)
+                continue
+            
+            for row in chunk.itertuples(index=False, name='Row'):
                 member_records.append({
-                    'member_id': member_id,
-                    'member_name': row['member_name'],
-                    'bio_or_comment': row['bio_or_comment']
+                    'member_id': member_ids[row.member_name],
+                    'member_name': row.member_name,
+                    'bio_or_comment': row.bio_or_comment
                 })
-                
-                db.log_processing(
-                    member_id=member_id,
-                    member_name=row['member_name'],
-                    stage='ingestion',
-                    status='success'
-                )
-                
-            except Exception as e:
-                logger.error(f"Failed to insert {row['member_name']}: {e}")
-                db.log_processing(
-                    member_id=None,
-                    member_name=row['member_name'],
-                    stage='ingestion',
-                    status='error',
-                    error_msg=str(e)
-                )
+            
+            log_entries.extend((member_ids[name], name, 'ingestion', 'success', None) for name in names)
+        
+        # One logging transaction for the whole stage
+        db.log_processing_many(log_entries)
+        
+        if not member_records:
+            logger.error("No valid records to process. Exiting.")
+            db.close()
+            return
         
         logger.info(f"✓ Loaded {len(member_records)} members into database")
         
@@ -105,57 +132,80 @@ class VolunteerPipeline:
         logger.info("\n[STEP 4] Starting AI enrichment...")
         
         try:
-            enricher = AIEnricher(api_key=self.api_key)
+            enricher = AIEnricher(api_key=self.api_key, cache=db, force_refresh=self.force_refresh)
         except ValueError as e:
             logger.error(f"Failed to initialize AI enricher: {e}")
             logger.error("Set OPENROUTER_API_KEY environment variable or pass api_key parameter")
+            db.close()
             return
         
         # Create enrichment run
         run_id = db.create_enrichment_run(
             model_name=enricher.model_name,
-            prompt_version="v1.0"
+            prompt_version=PROMPT_VERSION
+        )
+        
+        logger.info(f"Enriching {len(member_records)} members "
+                    f"(concurrency={self.concurrency}, max_per_second={self.max_per_second}, "
+                    f"batch_size={self.batch_size})")
+        results = enricher.enrich_batch(
+            member_records,
+            concurrency=self.concurrency,
+            max_per_second=self.max_per_second,
+            return_exceptions=True,
+            batch_size=self.batch_size
         )
         
-        enriched_count = 0
-        failed_count = 0
+        enrichments = []
+        log_entries = []
         
-        for i, record in enumerate(member_records):
-            logger.info(f"Enriching [{i+1}/{len(member_records)}]: {record['member_name']}")
+        for record, result in zip(member_records, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to enrich {record['member_name']}: {result}")
+                log_entries.append((record['member_id'], record['member_name'], 'enrichment', 'error', str(result)))
+                continue
             
-            try:
-                result = enricher.enrich_bio(record['bio_or_comment'])
-                
-                db.insert_enrichment(
-                    member_id=record['member_id'],
-                    skills=result.skills,
-                    persona=result.persona,
-                    confidence=result.confidence_score,
-                    reasoning=result.reasoning,
-                    version=run_id
-                )
-                
-                db.log_processing(
-                    member_id=record['member_id'],
-                    member_name=record['member_name'],
-                    stage='enrichment',
-                    status='success'
-                )
-                
-                enriched_count += 1
-                
-                logger.info(f"  → Persona: {result.persona}, Confidence: {result.confidence_score:.2f}, Skills: {len(result.skills)}")
-                
-            except Exception as e:
-                logger.error(f"Failed to enrich {record['member_name']}: {e}")
-                db.log_processing(
-                    member_id=record['member_id'],
-                    member_name=record['member_name'],
-                    stage='enrichment',
-                    status='error',
-                    error_msg=str(e)
-                )
-                failed_count += 1
+            enrichments.append({
+                'member_id': record['member_id'],
+                'skills': result['skills'],
+                'persona': result['persona'],
+                'confidence': result['confidence_score'],
+                'reasoning': result['reasoning']
+            })
+            log_entries.append((record['member_id'], record['member_name'], 'enrichment', 'success', None))
+        
+        # Write every result in one transaction once the batch has finished
+        try:
+            db.insert_enrichments_bulk(enrichments, version=run_id)
+        except Exception as e:
+            # Retry member by member so one bad result only loses that member
+            logger.error(f"Failed to store enrichment results in bulk, storing individually: {e}")
+            store_errors = {}
+            
+            for enrichment in enrichments:
+                try:
+                    db.insert_enrichment(
+                        member_id=enrichment['member_id'],
+                        skills=enrichment['skills'],
+                        persona=enrichment['persona'],
+                        confidence=enrichment['confidence'],
+                        reasoning=enrichment['reasoning'],
+                        version=run_id
+                    )
+                except Exception as member_error:
+                    store_errors[enrichment['member_id']] = str(member_error)
+            
+            enrichments = [e for e in enrichments if e['member_id'] not in store_errors]
+            log_entries = [
+                (member_id, member_name, stage, 'error', store_errors[member_id])
+                if member_id in store_errors else (member_id, member_name, stage, status, error_msg)
+                for member_id, member_name, stage, status, error_msg in log_entries
+            ]
+        
+        db.log_processing_many(log_entries)
+        
+        enriched_count = len(enrichments)
+        failed_count = len(member_records) - enriched_count
         
         # Update enrichment run
         db.update_enrichment_run(
@@ -167,6 +217,9 @@ class VolunteerPipeline:
         
         logger.info(f"✓ AI enrichment completed: {enriched_count} success, {failed_count} failed")
         
+        # Let the planner see the freshly loaded row counts
+        db.analyze()
+        
         # Step 5: Generate summary
         logger.info("\n[STEP 5] Generating pipeline summary...")
         self._generate_summary(db, enriched_count, failed_count)
@@ -186,17 +239,7 @@ class VolunteerPipeline:
     
     def _generate_summary(self, db: DatabaseManager, enriched: int, failed: int):
         """Generate and display pipeline summary"""
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Get persona distribution
-        cursor.execute('''
-            SELECT persona_type, COUNT(*) as count, AVG(confidence_score) as avg_conf
-            FROM member_personas
-            WHERE is_current = 1
-            GROUP BY persona_type
-            ORDER BY count DESC
-        ''')
+        summary = fetch_summary(db.get_connection())
         
         print("\n" + "-" * 80)
         print("PIPELINE SUMMARY")
@@ -206,31 +249,15 @@ class VolunteerPipeline:
         print(f"Failed: {failed}")
         print("\nPersona Distribution:")
         
-        for row in cursor.fetchall():
-            print(f"  {row[0]:25s} {row[1]:3d} members (avg confidence: {row[2]:.2f})")
-        
-        # Top skills
-        cursor.execute('''
-            SELECT s.skill_name, COUNT(*) as count
-            FROM member_skills ms
-            JOIN skills s ON ms.skill_id = s.skill_id
-            GROUP BY s.skill_name
-            ORDER BY count DESC
-            LIMIT 10
-        ''')
+        for persona, (count, avg_conf) in summary['persona_distribution'].items():
+            print(f"  {persona:25s} {count:3d} members (avg confidence: {avg_conf:.2f})")
         
         print("\nTop 10 Skills:")
-        for row in cursor.fetchall():
-            print(f"  {row[0]:25s} {row[1]:3d} members")
+        for skill, count in summary['top_skills'].items():
+            print(f"  {skill:25s} {count:3d} members")
         
         # Low confidence warnings
-        cursor.execute('''
-            SELECT COUNT(*) as count
-            FROM member_personas
-            WHERE is_current = 1 AND confidence_score < 0.5
-        ''')
-        
-        low_conf_count = cursor.fetchone()[0]
+        low_conf_count = summary['low_confidence_count']
         if low_conf_count > 0:
             print(f"\n⚠ Warning: {low_conf_count} members have confidence score < 0.5")
             print("  Run: python query_interface.py low-confidence")
@@ -246,6 +273,14 @@ def main():
     parser.add_argument('csv_file', type=str, help='Path to input CSV file')
     parser.add_argument('--db', type=str, default='volunteer_data.db', help='Database path')
     parser.add_argument('--api-key', type=str, help='OpenRouter API key')
+    parser.add_argument('--force-refresh', action='store_true',
+                        help='Ignore cached enrichment results and call the API for every bio')
+    parser.add_argument('--concurrency', type=int, default=10,
+                        help='Maximum number of enrichment requests in flight')
+    parser.add_argument('--max-per-second', type=float, default=5.0,
+                        help='Sustained enrichment request rate')
+    parser.add_argument('--batch-size', type=int, default=10,
+                        help='Number of bios sent per enrichment request')
     
     args = parser.parse_args()
     
@@ -258,7 +293,11 @@ def main():
     pipeline = VolunteerPipeline(
         csv_path=args.csv_file,
         db_path=args.db,
-        api_key=args.api_key
+        api_key=args.api_key,
+        force_refresh=args.force_refresh,
+        concurrency=args.concurrency,
+        max_per_second=args.max_per_second,
+        batch_size=args.batch_size
     )
     
     pipeline.run()
@@ -1,22 +1,108 @@
 import sqlite3
 import argparse
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Iterator, List, Dict, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
 import json
+from operator import attrgetter
+
+if TYPE_CHECKING:
+    # The DataFrame helpers import pandas lazily, so plain CLI queries skip its import cost
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON output
+    orjson = None
+
+from database import configure_connection, fetch_summary
+
+# ASCII unit separator for GROUP_CONCAT, since skill names may themselves contain commas
+SKILL_SEPARATOR = '\x1f'
+
+
+def _split_skills(value: Optional[str]) -> List[str]:
+    """Split a GROUP_CONCAT(skill_name, CHAR(31)) value into distinct skill names"""
+    # GROUP_CONCAT(DISTINCT ...) cannot take a separator before SQLite 3.44, and
+    # a skill recorded under several enrichment versions appears once per version
+    return list(dict.fromkeys(value.split(SKILL_SEPARATOR))) if value else []
+
+
+
+def dump(obj) -> str:
+    """Serialize query results as indented JSON for CLI output"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+class Mentor(NamedTuple):
+    """Ranked mentor candidate returned by query_mentors"""
+    member_id: int
+    member_name: str
+    bio_or_comment: str
+    last_active_date: Optional[str]
+    persona_type: str
+    confidence_score: float
+    reasoning: Optional[str]
+    days_since_active: Optional[float]
+    skill_count: int
+    skills: List[str]
+    ranking_score: float
+
+
+class PersonaMember(NamedTuple):
+    """Member returned by query_by_persona"""
+    member_id: int
+    member_name: str
+    bio_or_comment: str
+    last_active_date: Optional[str]
+    persona_type: str
+    confidence_score: float
+    reasoning: Optional[str]
+    skills: List[str]
+
+
+class SkillMatch(NamedTuple):
+    """Member returned by query_by_skills"""
+    member_id: int
+    member_name: str
+    bio_or_comment: str
+    last_active_date: Optional[str]
+    persona_type: str
+    confidence_score: float
+    matching_skills: int
+    skills: List[str]
+
+
+class LowConfidenceMember(NamedTuple):
+    """Member returned by query_low_confidence"""
+    member_id: int
+    member_name: str
+    bio_or_comment: str
+    persona_type: str
+    confidence_score: float
+    reasoning: Optional[str]
 
 
 class VolunteerQueryEngine:
     """Query engine for volunteer database"""
     
-    def __init__(self, db_path: str = 'volunteer_data.db'):
+    def __init__(self, db_path: str = 'volunteer_data.db', check_same_thread: bool = True):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
+        # Read-only workload: autocommit mode, no implicit transactions
+        self.conn = configure_connection(
+            sqlite3.connect(db_path, isolation_level=None, check_same_thread=check_same_thread)
+        )
+        
+        # Full-text member index, created by DatabaseManager when FTS5 is available
+        self.has_member_search = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'members_fts'"
+        ).fetchone() is not None
     
     def query_mentors(self, location: Optional[str] = None, 
                      min_confidence: float = 0.0,
                      recency_days: Optional[int] = None,
-                     required_skills: Optional[List[str]] = None) -> List[Dict]:
+                     required_skills: Optional[List[str]] = None) -> List[Mentor]:
         """
         Query for potential mentors with ranking
         
@@ -26,6 +112,88 @@ class VolunteerQueryEngine:
             recency_days: Only include members active within N days
             required_skills: List of required skills
         """
+        results = list(self.iter_query_mentors(location, min_confidence, recency_days, required_skills))
+        
+        # Sort by ranking score
+        results.sort(key=attrgetter('ranking_score'), reverse=True)
+        
+        return results
+    
+    def iter_query_mentors(self, location: Optional[str] = None,
+                           min_confidence: float = 0.0,
+                           recency_days: Optional[int] = None,
+                           required_skills: Optional[List[str]] = None,
+                           page_size: int = 1000) -> Iterator[Mentor]:
+        """
+        Yield potential mentors with their ranking score, unsorted
+        
+        Rows are fetched from SQLite page_size at a time rather than all at once.
+        Takes the same filters as query_mentors.
+        """
+        query, params = self._mentor_query(location, min_confidence, recency_days, required_skills)
+        
+        cursor = self.conn.cursor()
+        cursor.arraysize = page_size
+        cursor.execute(query, params)
+        
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            
+            skills_by_member = self._mentor_skills([row[0] for row in rows])
+            
+            for row in rows:
+                member_id, *_, confidence_score, _, days_since_active, skill_count = row
+                
+                yield Mentor(
+                    *row,
+                    skills=skills_by_member.get(member_id, []),
+                    ranking_score=self._calculate_ranking_score(
+                        confidence_score, days_since_active, skill_count
+                    )
+                )
+    
+    def query_mentors_df(self, location: Optional[str] = None,
+                         min_confidence: float = 0.0,
+                         recency_days: Optional[int] = None,
+                         required_skills: Optional[List[str]] = None) -> 'pd.DataFrame':
+        """
+        Query for potential mentors as a ranked DataFrame
+        
+        Takes the same filters as query_mentors; last_active_date is parsed to datetimes.
+        """
+        import pandas as pd
+        
+        query, params = self._mentor_query(location, min_confidence, recency_days, required_skills)
+        df = pd.read_sql_query(query, self.conn, params=params, parse_dates=['last_active_date'])
+        
+        skills_by_member = self._mentor_skills(df['member_id'].tolist())
+        df['skills'] = [skills_by_member.get(member_id, []) for member_id in df['member_id']]
+        
+        return self.rank_mentors_df(df)
+    
+    @staticmethod
+    def rank_mentors_df(df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Add a ranking_score column and sort by it, best first
+        
+        Vectorized form of _calculate_ranking_score over the days_since_active,
+        skill_count and confidence_score columns.
+        """
+        import numpy as np
+        
+        # astype(float): a column of only NULLs comes back from SQLite as object dtype
+        recency_factor = np.maximum(0.1, 1.0 - df['days_since_active'].astype(float) / 365.0).fillna(0.5)
+        skill_factor = np.minimum(1.0, 0.5 + df['skill_count'] * 0.1)
+        
+        df['ranking_score'] = (df['confidence_score'] * recency_factor * skill_factor).astype(float)
+        return df.sort_values('ranking_score', ascending=False)
+    
+    def _mentor_query(self, location: Optional[str], min_confidence: float,
+                      recency_days: Optional[int],
+                      required_skills: Optional[List[str]]) -> Tuple[str, List]:
+        """Build the filtered mentor candidate query and its parameters"""
         query = '''
             SELECT 
                 m.member_id,
@@ -35,12 +203,14 @@ class VolunteerQueryEngine:
                 p.persona_type,
                 p.confidence_score,
                 p.reasoning,
-                GROUP_CONCAT(DISTINCT s.skill_name) as skills,
-                julianday('now') - julianday(m.last_active_date) as days_since_active
+                julianday('now') - julianday(m.last_active_date) as days_since_active,
+                (
+                    SELECT COUNT(DISTINCT ms.skill_id)
+                    FROM member_skills ms
+                    WHERE ms.member_id = m.member_id
+                ) as skill_count
             FROM members m
             JOIN member_personas p ON m.member_id = p.member_id
-            LEFT JOIN member_skills ms ON m.member_id = ms.member_id
-            LEFT JOIN skills s ON ms.skill_id = s.skill_id
             WHERE p.is_current = 1
             AND p.persona_type = 'Mentor Material'
             AND p.confidence_score >= ?
@@ -48,7 +218,12 @@ class VolunteerQueryEngine:
         
         params = [min_confidence]
         
-        if location:
+        if location and self.has_member_search and len(location) >= 3:
+            # Trigram index lookup; a quoted phrase matches as a substring, like LIKE
+            query += ' AND m.member_id IN (SELECT rowid FROM members_fts WHERE members_fts MATCH ?)'
+            params.append('"' + location.replace('"', '""') + '"')
+        elif location:
+            # Trigrams need at least three characters; shorter terms scan with LIKE
             query += ' AND (m.bio_or_comment LIKE ? OR m.member_name LIKE ?)'
             location_pattern = f'%{location}%'
             params.extend([location_pattern, location_pattern])
@@ -58,37 +233,45 @@ class VolunteerQueryEngine:
             query += ' AND m.last_active_date >= ?'
             params.append(cutoff_date)
         
-        query += ' GROUP BY m.member_id'
-        
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        
-        results = []
-        for row in cursor.fetchall():
-            result = dict(row)
-            result['skills'] = result['skills'].split(',') if result['skills'] else []
-            
-            # Filter by required skills if specified
-            if required_skills:
-                member_skills_lower = [s.lower() for s in result['skills']]
-                if not all(skill.lower() in member_skills_lower for skill in required_skills):
-                    continue
-            
-            # Calculate ranking score
-            result['ranking_score'] = self._calculate_ranking_score(
-                result['confidence_score'],
-                result['days_since_active'],
-                len(result['skills'])
+        if required_skills:
+            # Members holding every required skill (skill names are stored lowercased)
+            skill_names = sorted({skill.strip().lower() for skill in required_skills})
+            placeholders = ','.join('?' for _ in skill_names)
+            query += f'''
+            AND m.member_id IN (
+                SELECT ms2.member_id
+                FROM member_skills ms2
+                JOIN skills s2 ON ms2.skill_id = s2.skill_id
+                WHERE s2.skill_name IN ({placeholders})
+                GROUP BY ms2.member_id
+                HAVING COUNT(DISTINCT s2.skill_id) = ?
             )
-            
-            results.append(result)
+            '''
+            params.extend(skill_names)
+            params.append(len(skill_names))
         
-        # Sort by ranking score
-        results.sort(key=lambda x: x['ranking_score'], reverse=True)
+        query += ' GROUP BY m.member_id'
         
-        return results
+        return query, params
     
-    def query_by_persona(self, persona: str, limit: int = 10) -> List[Dict]:
+    def _mentor_skills(self, member_ids: List[int]) -> Dict[int, List[str]]:
+        """Map member_id to skill names for the given mentor candidates"""
+        # Flat queries rather than aggregating strings per member inside the main query,
+        # chunked to stay under SQLite's variable limit
+        skills_by_member = {}
+        for i in range(0, len(member_ids), 500):
+            chunk = member_ids[i:i + 500]
+            placeholders = ','.join('?' for _ in chunk)
+            for member_id, skill_name in self.conn.execute(f'''
+                SELECT DISTINCT ms.member_id, s.skill_name
+                FROM member_skills ms
+                JOIN skills s ON ms.skill_id = s.skill_id
+                WHERE ms.member_id IN ({placeholders})
+            ''', chunk):
+                skills_by_member.setdefault(member_id, []).append(skill_name)
+        return skills_by_member
+    
+    def query_by_persona(self, persona: str, limit: int = 10) -> List[PersonaMember]:
         """Query members by persona type"""
         query = '''
             SELECT 
@@ -99,7 +282,7 @@ class VolunteerQueryEngine:
                 p.persona_type,
                 p.confidence_score,
                 p.reasoning,
-                GROUP_CONCAT(DISTINCT s.skill_name) as skills
+                GROUP_CONCAT(s.skill_name, CHAR(31)) as skills
             FROM members m
             JOIN member_personas p ON m.member_id = p.member_id
             LEFT JOIN member_skills ms ON m.member_id = ms.member_id
@@ -114,15 +297,9 @@ class VolunteerQueryEngine:
         cursor = self.conn.cursor()
         cursor.execute(query, (persona, limit))
         
-        results = []
-        for row in cursor.fetchall():
-            result = dict(row)
-            result['skills'] = result['skills'].split(',') if result['skills'] else []
-            results.append(result)
-        
-        return results
+        return [PersonaMember(*row[:-1], _split_skills(row[-1])) for row in cursor.fetchall()]
     
-    def query_by_skills(self, skills: List[str], match_all: bool = True) -> List[Dict]:
+    def query_by_skills(self, skills: List[str], match_all: bool = True) -> List[SkillMatch]:
         """
         Query members by skills
         
@@ -143,7 +320,8 @@ class VolunteerQueryEngine:
                     m.last_active_date,
                     p.persona_type,
                     p.confidence_score,
-                    GROUP_CONCAT(DISTINCT s.skill_name) as skills
+                    COUNT(DISTINCT s.skill_id) as matching_skills,
+                    GROUP_CONCAT(s.skill_name, CHAR(31)) as skills
                 FROM members m
                 JOIN member_personas p ON m.member_id = p.member_id
                 JOIN member_skills ms ON m.member_id = ms.member_id
@@ -151,7 +329,7 @@ class VolunteerQueryEngine:
                 WHERE p.is_current = 1
                 AND s.skill_name IN ({placeholders})
                 GROUP BY m.member_id
-                HAVING COUNT(DISTINCT s.skill_id) = ?
+                HAVING matching_skills = ?
                 ORDER BY p.confidence_score DESC
             '''
             params = skills_lower + [len(skills_lower)]
@@ -165,8 +343,8 @@ class VolunteerQueryEngine:
                     m.last_active_date,
                     p.persona_type,
                     p.confidence_score,
-                    GROUP_CONCAT(DISTINCT s.skill_name) as skills,
-                    COUNT(DISTINCT s.skill_id) as matching_skills
+                    COUNT(DISTINCT s.skill_id) as matching_skills,
+                    GROUP_CONCAT(s.skill_name, CHAR(31)) as skills
                 FROM members m
                 JOIN member_personas p ON m.member_id = p.member_id
                 JOIN member_skills ms ON m.member_id = ms.member_id
@@ -181,15 +359,9 @@ class VolunteerQueryEngine:
         cursor = self.conn.cursor()
         cursor.execute(query, params)
         
-        results = []
-        for row in cursor.fetchall():
-            result = dict(row)
-            result['skills'] = result['skills'].split(',') if result['skills'] else []
-            results.append(result)
-        
-        return results
+        return [SkillMatch(*row[:-1], _split_skills(row[-1])) for row in cursor.fetchall()]
     
-    def query_low_confidence(self, threshold: float = 0.5) -> List[Dict]:
+    def query_low_confidence(self, threshold: float = 0.5) -> List[LowConfidenceMember]:
         """Find members with low confidence scores for review"""
         query = '''
             SELECT 
@@ -209,50 +381,20 @@ class VolunteerQueryEngine:
         cursor = self.conn.cursor()
         cursor.execute(query, (threshold,))
         
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(row))
-        
-        return results
+        return list(map(LowConfidenceMember._make, cursor.fetchall()))
     
     def get_statistics(self) -> Dict:
         """Get database statistics"""
-        cursor = self.conn.cursor()
+        summary = fetch_summary(self.conn)
         
-        stats = {}
-        
-        # Total members
-        cursor.execute('SELECT COUNT(*) as count FROM members')
-        stats['total_members'] = cursor.fetchone()['count']
-        
-        # Persona breakdown
-        cursor.execute('''
-            SELECT persona_type, COUNT(*) as count
-            FROM member_personas
-            WHERE is_current = 1
-            GROUP BY persona_type
-            ORDER BY count DESC
-        ''')
-        stats['persona_distribution'] = {row['persona_type']: row['count'] for row in cursor.fetchall()}
-        
-        # Average confidence
-        cursor.execute('''
-            SELECT AVG(confidence_score) as avg_confidence
-            FROM member_personas
-            WHERE is_current = 1
-        ''')
-        stats['average_confidence'] = cursor.fetchone()['avg_confidence']
-        
-        # Top skills
-        cursor.execute('''
-            SELECT s.skill_name, COUNT(*) as count
-            FROM member_skills ms
-            JOIN skills s ON ms.skill_id = s.skill_id
-            GROUP BY s.skill_name
-            ORDER BY count DESC
-            LIMIT 10
-        ''')
-        stats['top_skills'] = {row['skill_name']: row['count'] for row in cursor.fetchall()}
+        stats = {
+            'total_members': summary['total_members'],
+            'persona_distribution': {
+                persona: count for persona, (count, _) in summary['persona_distribution'].items()
+            },
+            'average_confidence': summary['average_confidence'],
+            'top_skills': summary['top_skills']
+        }
         
         return stats
     
@@ -320,23 +462,23 @@ def main():
                 recency_days=args.recency_days,
                 required_skills=args.skills
             )
-            print(json.dumps(results, indent=2, default=str))
+            print(dump([result._asdict() for result in results]))
             
         elif args.command == 'persona':
             results = engine.query_by_persona(args.type, args.limit)
-            print(json.dumps(results, indent=2, default=str))
+            print(dump([result._asdict() for result in results]))
             
         elif args.command == 'skills':
             results = engine.query_by_skills(args.skills, args.match_all)
-            print(json.dumps(results, indent=2, default=str))
+            print(dump([result._asdict() for result in results]))
             
         elif args.command == 'low-confidence':
             results = engine.query_low_confidence(args.threshold)
-            print(json.dumps(results, indent=2, default=str))
+            print(dump([result._asdict() for result in results]))
             
         elif args.command == 'stats':
             stats = engine.get_statistics()
-            print(json.dumps(stats, indent=2, default=str))
+            print(dump(stats))
             
         else:
             parser.print_help()